@@ -1,15 +1,99 @@
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from lxml import etree
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+from functools import lru_cache
 import re
 from typing import List, Dict, Set
 import json
 import logging
+import logging.handlers
+import queue as queue_module
 import random
 from fake_useragent import UserAgent
+import time
 from datetime import datetime
 
+try:
+    from pybloom_live import ScalableBloomFilter  # optional: compact visited set
+except ImportError:
+    ScalableBloomFilter = None
+
+try:
+    import uvloop  # optional: libuv event loop, ~2-4x faster dispatch
+except ImportError:
+    uvloop = None
+
+try:
+    import aiodns  # optional: enables aiohttp's c-ares async resolver
+except ImportError:
+    aiodns = None
+
+# Discovered links feed back into the visited check, so the same URL is
+# parsed repeatedly; cache the split results
+_parse_url = lru_cache(maxsize=8192)(urlparse)
+
+
+def _canonicalize(url: str) -> str:
+    """Normalize a URL so fragment and query-order variants dedupe to one key."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query)))
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, '')
+    )
+
+
+def _setup_logging() -> logging.Logger:
+    # Route records through a queue so handler I/O runs on a background
+    # thread instead of blocking the event loop on every log call
+    logger = logging.getLogger(__name__)
+    if not logger.handlers:
+        log_queue = queue_module.Queue(-1)
+        handler = logging.StreamHandler()
+        handler.setFormatter(
+            logging.Formatter('%(asctime)s - %(levelname)s: %(message)s')
+        )
+        listener = logging.handlers.QueueListener(log_queue, handler)
+        listener.start()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.setLevel(logging.INFO)
+    return logger
+
+
+_LOGGER = _setup_logging()
+
+
+def _make_seen_set():
+    # A Bloom filter holds ~10 bits per URL instead of the full string;
+    # the 0.1% false-positive rate only means a rare URL gets skipped
+    if ScalableBloomFilter is not None:
+        return ScalableBloomFilter(initial_capacity=100_000, error_rate=0.001)
+    return set()
+
+# Configured once on the session; a per-call timeout made aiohttp build
+# a fresh timer wrapper for every request
+_CLIENT_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5, sock_read=5)
+
+# Static assets are never product or navigation pages; skip them before
+# paying for the download and parse
+_SKIP_EXT_RE = re.compile(
+    r'\.(jpg|jpeg|png|gif|webp|svg|css|js|pdf|zip|mp4|ico|woff2?)(\?|$)', re.I
+)
+
+_DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0',
+}
+
 
 class EcommerceCrawler:
     def __init__(
@@ -26,21 +110,12 @@ class EcommerceCrawler:
         self.custom_headers = custom_headers or {}
         self.rotate_user_agents = rotate_user_agents
 
-        self.ua = UserAgent() # User-Agent rotator
-
-        self.default_headers = {
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0',
-        }
+        # Sample fake_useragent once; per-request rotation is then a
+        # cheap random.choice instead of hitting its data blob each call
+        self.ua = UserAgent()
+        self._ua_pool = tuple({self.ua.random for _ in range(50)})
+
+        self._header_templates = {}
 
         self.product_url_patterns = [
             r'/product/',
@@ -48,34 +123,41 @@ class EcommerceCrawler:
             r'/p/',
             r'/products?/',
             r'/shop/',
-            r'\d{4,8}'
+            # Standalone 4-8 digit id in a path segment; the bare \d{4,8}
+            # also matched timestamps and category ids anywhere in the URL
+            r'/[^/]*?(?<!\d)\d{4,8}(?!\d)(?:[/?#-]|$)'
         ]
-
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s: %(message)s'
+        # Single compiled alternation so each URL check is one C-level scan
+        self._product_re = re.compile(
+            '|'.join(f'(?:{p})' for p in self.product_url_patterns)
         )
-        self.logger = logging.getLogger(__name__)
-
-        self.stats = {
-            'requests': 0,
-            'successful_requests': 0,
-            'failed_requests': 0,
-            'start_time': None,
-            'end_time': None
-        }
-
-    def _get_headers(self, domain: str) -> Dict[str, str]:
-        headers = self.default_headers.copy()
-
-        if self.rotate_user_agents:
-            headers['User-Agent'] = self.ua.random
 
-        headers['Referer'] = f'https://{domain}'
+        self.logger = _LOGGER
 
-        headers.update(self.custom_headers)
+        # Plain attributes: single-threaded asyncio never preempts the
+        # += between tasks, and attribute access skips the dict hashing
+        self.requests = 0
+        self.successful_requests = 0
+        self.failed_requests = 0
+        self.start_time = None
+        self.end_time = None
 
-        headers['X-Request-Timestamp'] = str(datetime.now().timestamp())
+    def _get_headers(self, domain: str) -> Dict[str, str]:
+        # Defaults, Referer and custom headers never change for a domain;
+        # merge them once and only stamp UA and timestamp per request
+        template = self._header_templates.get(domain)
+        if template is None:
+            template = {
+                **_DEFAULT_HEADERS,
+                'Referer': f'https://{domain}',
+                **self.custom_headers
+            }
+            self._header_templates[domain] = template
+
+        headers = {**template, 'X-Request-Timestamp': format(time.time(), '.3f')}
+
+        if self.rotate_user_agents and 'User-Agent' not in self.custom_headers:
+            headers['User-Agent'] = random.choice(self._ua_pool)
 
         return headers
 
@@ -84,122 +166,159 @@ class EcommerceCrawler:
         return domain.rstrip('/')
 
     def _is_potential_product_url(self, url: str) -> bool:
-        url = url.lower()
-        return any(re.search(pattern, url) for pattern in self.product_url_patterns)
+        return self._product_re.search(url.lower()) is not None
 
-    async def _fetch_page(
+    async def _fetch_links(
             self,
             session: aiohttp.ClientSession,
             url: str,
             domain: str
-    ) -> str:
-        self.stats['requests'] += 1
+    ) -> Set[str]:
+        # Stream the body through an incremental parser so link extraction
+        # overlaps with the network read and only one chunk stays buffered
+        self.requests += 1
 
+        hrefs = []
         try:
             headers = self._get_headers(domain)
             async with session.get(
                     url,
                     headers=headers,
-                    timeout=10,
                     allow_redirects=True
             ) as response:
-                self.stats['successful_requests'] += 1
-                return await response.text()
+                if response.content_type not in ('text/html', 'application/xhtml+xml'):
+                    self.successful_requests += 1
+                    return set()
+
+                parser = etree.HTMLPullParser(events=('start',), recover=True)
+
+                async for chunk in response.content.iter_chunked(32768):
+                    parser.feed(chunk)
+                    for _, element in parser.read_events():
+                        if element.tag == 'a':
+                            href = element.get('href')
+                            if href:
+                                hrefs.append(href)
+                            element.clear()
+
+                self.successful_requests += 1
         except Exception as e:
-            self.stats['failed_requests'] += 1
-            self.logger.error(f"Error fetching {url}: {e}")
-            return ""
+            self.failed_requests += 1
+            self.logger.error("Error fetching %s: %s", url, e)
+            return set()
 
-    async def _extract_links(self, base_url: str, html_content: str) -> Set[str]:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        base_netloc = _parse_url(url).netloc
         links = set()
-
-        for a_tag in soup.find_all('a', href=True):
-            link = urljoin(base_url, a_tag['href'])
-            parsed_link = urlparse(link)
-
-            if parsed_link.netloc == urlparse(base_url).netloc:
+        for href in hrefs:
+            link = urljoin(url, href)
+            if _parse_url(link).netloc == base_netloc:
                 links.add(link)
 
         return links
 
-    async def crawl_domain(self, domain: str) -> List[str]:
+    async def crawl_domain(self, domain: str, session: aiohttp.ClientSession) -> List[str]:
         base_url = f"https://{domain}"
         product_urls = set()
-        visited_urls = set()
-
-        # Configure client session with TCP connector settings
-        connector = aiohttp.TCPConnector(
-            limit_per_host=self.concurrent_requests,
-            force_close=True
-        )
-
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async def crawl_page(url: str, depth: int):
-                if depth > self.max_depth or url in visited_urls:
-                    return
+        visited_urls = _make_seen_set()
+        visited_urls.add(_canonicalize(base_url))
 
-                visited_urls.add(url)
+        # Bounded worker pool: live coroutines stay capped at
+        # concurrent_requests instead of growing with the link frontier
+        queue = asyncio.Queue()
+        queue.put_nowait((base_url, 0))
 
+        async def worker():
+            while True:
+                url, depth = await queue.get()
                 try:
-                    html_content = await self._fetch_page(session, url, domain)
-
                     if self._is_potential_product_url(url):
                         product_urls.add(url)
-                        self.logger.info(f"Found product URL: {url}")
-
-                    links = await self._extract_links(url, html_content)
+                        self.logger.info("Found product URL: %s", url)
 
-                    tasks = []
-                    for link in links:
-                        if self._is_potential_product_url(link) and link not in visited_urls:
-                            tasks.append(crawl_page(link, depth + 1))
+                    links = await self._fetch_links(session, url, domain)
 
-                    if tasks:
-                        await asyncio.gather(*tasks)
+                    if depth < self.max_depth:
+                        for link in links:
+                            if _SKIP_EXT_RE.search(link):
+                                continue
+                            if not self._is_potential_product_url(link):
+                                continue
+                            key = _canonicalize(link)
+                            if key not in visited_urls:
+                                visited_urls.add(key)
+                                queue.put_nowait((link, depth + 1))
 
                 except Exception as e:
-                    self.logger.error(f"Error crawling {url}: {e}")
+                    self.logger.error("Error crawling %s: %s", url, e)
+                finally:
+                    queue.task_done()
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(self.concurrent_requests)
+        ]
 
-            await crawl_page(base_url, 0)
+        try:
+            await queue.join()
+        finally:
+            for w in workers:
+                w.cancel()
 
         return list(product_urls)
 
     async def discover_product_urls(self) -> Dict[str, List[str]]:
-        self.stats['start_time'] = datetime.now()
+        self.start_time = datetime.now()
         results = {}
 
-        async def crawl_with_timeout(domain):
-            try:
-                product_urls = await asyncio.wait_for(
-                    self.crawl_domain(domain),
-                    timeout=300  # 5-minute timeout per domain
-                )
-                results[domain] = product_urls
-            except asyncio.TimeoutError:
-                self.logger.warning(f"Crawling {domain} timed out")
-                results[domain] = []
-
-        await asyncio.gather(
-            *[crawl_with_timeout(domain) for domain in self.domains]
+        # One shared session so TCP/TLS connections are kept alive and
+        # reused across the whole crawl instead of re-handshaking per URL
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrent_requests * len(self.domains),
+            limit_per_host=self.concurrent_requests,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            enable_cleanup_closed=True,
+            # c-ares resolves in the loop instead of a getaddrinfo thread
+            resolver=aiohttp.AsyncResolver() if aiodns is not None else None
         )
 
-        self.stats['end_time'] = datetime.now()
+        async with aiohttp.ClientSession(
+                connector=connector,
+                timeout=_CLIENT_TIMEOUT
+        ) as session:
+            async def crawl_with_timeout(domain):
+                try:
+                    product_urls = await asyncio.wait_for(
+                        self.crawl_domain(domain, session),
+                        timeout=300  # 5-minute timeout per domain
+                    )
+                    results[domain] = product_urls
+                except asyncio.TimeoutError:
+                    self.logger.warning("Crawling %s timed out", domain)
+                    results[domain] = []
+
+            await asyncio.gather(
+                *[crawl_with_timeout(domain) for domain in self.domains]
+            )
+
+        self.end_time = datetime.now()
         return results
 
     def run(self) -> Dict[str, List[str]]:
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
         return asyncio.run(self.discover_product_urls())
 
     def print_stats(self):
-        if self.stats['start_time'] and self.stats['end_time']:
-            duration = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
-            success_rate = (self.stats['successful_requests'] / self.stats['requests'] * 100
-                            if self.stats['requests'] > 0 else 0)
+        if self.start_time and self.end_time:
+            duration = (self.end_time - self.start_time).total_seconds()
+            success_rate = (self.successful_requests / self.requests * 100
+                            if self.requests > 0 else 0)
 
             print("\nCrawling Statistics:")
-            print(f"Total Requests: {self.stats['requests']}")
-            print(f"Successful Requests: {self.stats['successful_requests']}")
-            print(f"Failed Requests: {self.stats['failed_requests']}")
+            print(f"Total Requests: {self.requests}")
+            print(f"Successful Requests: {self.successful_requests}")
+            print(f"Failed Requests: {self.failed_requests}")
             print(f"Success Rate: {success_rate:.2f}%")
             print(f"Total Duration: {duration:.2f} seconds")
 
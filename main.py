@@ -1,16 +1,173 @@
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
+import concurrent.futures
+import os
+from lxml import html as lxml_html
 import re
 from typing import List, Dict, Set, Optional
 import logging
+import logging.handlers
+import queue as queue_module
 import random
 from fake_useragent import UserAgent
+import time
 from datetime import datetime
 from playwright.async_api import async_playwright
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+from functools import lru_cache
 import json
 
+try:
+    import ahocorasick  # optional: single-pass literal keyword matching
+except ImportError:
+    ahocorasick = None
+
+try:
+    from pybloom_live import ScalableBloomFilter  # optional: compact visited set
+except ImportError:
+    ScalableBloomFilter = None
+
+try:
+    import hyperscan  # optional: SIMD multi-pattern scan for link batches
+except ImportError:
+    hyperscan = None
+
+try:
+    import uvloop  # optional: libuv event loop, ~2-4x faster dispatch
+except ImportError:
+    uvloop = None
+
+try:
+    import aiodns  # optional: enables aiohttp's c-ares async resolver
+except ImportError:
+    aiodns = None
+
+# Pattern-category ids reported by the hyperscan scratch scan
+_HS_TRAP = 0
+_HS_PAGINATION = 1
+_HS_PRODUCT = 2
+
+# Literal substrings marking login/cart/etc. trap links to skip
+TRAP_KEYWORDS = [
+    'login', 'signin', 'cart', 'checkout', 'account',
+    'wishlist', 'unsubscribe', 'email-preference'
+]
+
+# Extracted links are re-parsed by the filter, validity and visited
+# checks; cache the split results
+_parse_url = lru_cache(maxsize=8192)(urlparse)
+
+
+def _canonicalize(url: str) -> str:
+    """Normalize a URL so fragment and query-order variants dedupe to one key."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query)))
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, '')
+    )
+
+
+def _parse_links(base_url: str, html_content: str) -> List[str]:
+    """Extract same-host absolute links from an HTML body.
+
+    Module-level so it can be pickled and run in a worker process.
+    """
+    try:
+        doc = lxml_html.fromstring(html_content)
+        doc.make_links_absolute(base_url, resolve_base_href=True)
+    except Exception:
+        return []
+
+    base_netloc = urlsplit(base_url).netloc
+    return [
+        href for href in doc.xpath('//a/@href')
+        if urlsplit(href).netloc == base_netloc
+    ]
+
+
+def _setup_logging() -> logging.Logger:
+    # Route records through a queue so handler I/O runs on a background
+    # thread instead of blocking the event loop on every log call
+    logger = logging.getLogger(__name__)
+    if not logger.handlers:
+        log_queue = queue_module.Queue(-1)
+        handler = logging.StreamHandler()
+        handler.setFormatter(
+            logging.Formatter('%(asctime)s - %(levelname)s: %(message)s')
+        )
+        listener = logging.handlers.QueueListener(log_queue, handler)
+        listener.start()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.setLevel(logging.INFO)
+    return logger
+
+
+_LOGGER = _setup_logging()
+
+
+def _make_seen_set():
+    # A Bloom filter holds ~10 bits per URL instead of the full string;
+    # the 0.1% false-positive rate only means a rare URL gets skipped
+    if ScalableBloomFilter is not None:
+        return ScalableBloomFilter(initial_capacity=100_000, error_rate=0.001)
+    return set()
+
+
+class _TokenBucket:
+    """Async token bucket: requests within the per-second budget proceed
+    immediately, only over-budget callers wait for the next refill."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+# Configured once on the session; a per-call timeout made aiohttp build
+# a fresh timer wrapper for every request
+_CLIENT_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5, sock_read=5)
+
+# Static assets are never product or navigation pages; skip them before
+# paying for the download and parse
+_SKIP_EXT_RE = re.compile(
+    r'\.(jpg|jpeg|png|gif|webp|svg|css|js|pdf|zip|mp4|ico|woff2?)(\?|$)', re.I
+)
+
+# headers with browser-like behavior
+_DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0',
+    'sec-ch-ua': '"Google Chrome";v="119", "Chromium";v="119", "Not?A_Brand";v="24"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"'
+}
+
 
 class EnhancedEcommerceCrawler:
     def __init__(
@@ -33,46 +190,74 @@ class EnhancedEcommerceCrawler:
         self.respect_robots = respect_robots
         self.delay_range = delay_range
 
+        # Per-host token buckets sized to the same average request rate
+        # the old random sleep allowed, but without serializing workers.
+        # The old sleeps ran in every worker concurrently, so the budget
+        # scales with concurrent_requests; one bucket serves them all
+        requests_per_second = (
+            2.0 * concurrent_requests / (delay_range[0] + delay_range[1])
+        )
+        self._buckets = {
+            domain: _TokenBucket(rate=requests_per_second)
+            for domain in self.domains
+        }
+
         # session storage for cookies and tokens
         self.session_storage = {}
 
+        # One Chromium process for the whole crawl with one context per
+        # domain; launching per URL costs hundreds of ms each time
+        self._playwright = None
+        self._browser = None
+        self._contexts = {}
+        self._browser_lock = asyncio.Lock()
+        self._page_semaphore = asyncio.Semaphore(concurrent_requests)
+
         # robots.txt parsers
         self.robots_parsers = {}
 
         # URL patterns for different retailers
         self.retailer_patterns = self._initialize_retailer_patterns()
 
-        self.ua = UserAgent()
+        # Precompile one alternation per pattern list so each URL check
+        # is a single C-level scan instead of N re.search calls
+        for patterns in self.retailer_patterns.values():
+            patterns['product_re'] = re.compile(
+                '|'.join(f'(?:{p})' for p in patterns['product_patterns'])
+            )
+            patterns['pagination_re'] = re.compile(
+                '|'.join(f'(?:{p})' for p in patterns['pagination_patterns'])
+            )
 
-        # headers with browser-like behavior
-        self.default_headers = {
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0',
-            'sec-ch-ua': '"Google Chrome";v="119", "Chromium";v="119", "Not?A_Brand";v="24"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"'
-        }
+        self._site_type_cache = {}
+        self._header_templates = {}
 
-        self.stats = {
-            'requests': 0,
-            'successful_requests': 0,
-            'failed_requests': 0,
-            'start_time': None,
-            'end_time': None
-        }
+        self._trap_re = re.compile('|'.join(TRAP_KEYWORDS))
+
+        # Aho-Corasick automaton finds every trap keyword in one linear
+        # scan of the URL; the compiled alternation above is the fallback
+        if ahocorasick is not None:
+            self._trap_ac = ahocorasick.Automaton()
+            for keyword in TRAP_KEYWORDS:
+                self._trap_ac.add_word(keyword, keyword)
+            self._trap_ac.make_automaton()
+        else:
+            self._trap_ac = None
+
+        # Sample fake_useragent once; per-request rotation is then a
+        # cheap random.choice instead of hitting its data blob each call
+        self.ua = UserAgent()
+        self._ua_pool = tuple({self.ua.random for _ in range(50)})
+
+        # Plain attributes: single-threaded asyncio never preempts the
+        # += between tasks, and attribute access skips the dict hashing
+        self.requests = 0
+        self.successful_requests = 0
+        self.failed_requests = 0
+        self.start_time = None
+        self.end_time = None
 
-        logging.basicConfig(level=logging.INFO,
-                            format='%(asctime)s - %(levelname)s: %(message)s')
-        self.logger = logging.getLogger(__name__)
+        self.logger = _LOGGER
 
     def _initialize_retailer_patterns(self) -> Dict[str, Dict]:
         return {
@@ -104,7 +289,9 @@ class EnhancedEcommerceCrawler:
                     r'/p/',
                     r'/products?/',
                     r'/shop/',
-                    r'\d{4,8}'
+                    # Standalone 4-8 digit id in a path segment; the bare
+                    # \d{4,8} also matched timestamps and category ids
+                    r'/[^/]*?(?<!\d)\d{4,8}(?!\d)(?:[/?#-]|$)'
                 ],
                 'pagination_patterns': [
                     r'page=\d+',
@@ -114,23 +301,52 @@ class EnhancedEcommerceCrawler:
             }
         }
 
-    async def _handle_javascript_site(self, url: str) -> str:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
+    async def _get_browser_context(self, domain: str):
+        async with self._browser_lock:
+            context = self._contexts.get(domain)
+            if context is not None:
+                return context
+
+            if self._browser is None:
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+
+            context = await self._browser.new_context(
                 viewport={'width': 1920, 'height': 1080},
-                user_agent=self.ua.random
+                user_agent=random.choice(self._ua_pool)
             )
 
-            page = await context.new_page()
-
-            # common browser fingerprints
-            await page.add_init_script("""
+            # common browser fingerprints; applies to every page opened
+            # in this context
+            await context.add_init_script("""
                 Object.defineProperty(navigator, 'webdriver', {
                     get: () => false
                 });
             """)
 
+            self._contexts[domain] = context
+            return context
+
+    async def _close_browser(self):
+        for context in self._contexts.values():
+            await context.close()
+        self._contexts.clear()
+
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _handle_javascript_site(self, url: str, domain: str) -> str:
+        context = await self._get_browser_context(domain)
+
+        # Bound concurrent open tabs
+        async with self._page_semaphore:
+            page = await context.new_page()
+
             try:
                 # Set random delay before navigation
                 await asyncio.sleep(random.uniform(*self.delay_range))
@@ -144,7 +360,7 @@ class EnhancedEcommerceCrawler:
                 content = await page.content()
 
                 # Store session tokens or cookies
-                self.session_storage[urlparse(url).netloc] = {
+                self.session_storage[domain] = {
                     'cookies': await context.cookies(),
                     'localStorage': await page.evaluate('() => JSON.stringify(localStorage)')
                 }
@@ -152,10 +368,10 @@ class EnhancedEcommerceCrawler:
                 return content
 
             except Exception as e:
-                self.logger.error(f"Playwright error for {url}: {e}")
+                self.logger.error("Playwright error for %s: %s", url, e)
                 return ""
             finally:
-                await browser.close()
+                await page.close()
 
     async def _simulate_scrolling(self, page):
         try:
@@ -172,43 +388,52 @@ class EnhancedEcommerceCrawler:
                 await page.evaluate('window.scrollTo(0, 0)')
 
         except Exception as e:
-            self.logger.error(f"Error during scrolling simulation: {e}")
+            self.logger.error("Error during scrolling simulation: %s", e)
 
     def _detect_site_type(self, url: str) -> Dict:
-        domain = urlparse(url).netloc
-
-        for retailer, patterns in self.retailer_patterns.items():
-            if retailer in domain:
-                return patterns
-
-        return self.retailer_patterns['default']
-
-    async def _fetch_with_fallback(self, url: str, session) -> str:
+        # Bare domains ("amazon.com") parse with an empty netloc; fall
+        # back to the raw string so they resolve the same pattern set as
+        # their full URLs
+        netloc = _parse_url(url).netloc or url
+
+        # Every URL on a site resolves to the same pattern set, so scan
+        # the retailer table once per netloc and remember the answer
+        patterns = self._site_type_cache.get(netloc)
+        if patterns is None:
+            patterns = self.retailer_patterns['default']
+            for retailer, candidate in self.retailer_patterns.items():
+                if retailer in netloc:
+                    patterns = candidate
+                    break
+            self._site_type_cache[netloc] = patterns
+
+        return patterns
+
+    async def _fetch_with_fallback(self, url: str, session, domain: str) -> str:
         site_patterns = self._detect_site_type(url)
 
         # Playwright for JS-required sites
-        if site_patterns['js_required']:
-            content = await self._handle_javascript_site(url)
+        if self.use_playwright and site_patterns['js_required']:
+            content = await self._handle_javascript_site(url, domain)
             if content:
                 return content
 
         # Fallback to regular HTTP request
         try:
-            content = await self._fetch_page(session, url, urlparse(url).netloc)
+            content = await self._fetch_page(session, url, _parse_url(url).netloc)
             return content
         except Exception as e:
-            self.logger.error(f"Both fetch methods failed for {url}: {e}")
+            self.logger.error("Both fetch methods failed for %s: %s", url, e)
             return ""
 
+    def _is_trap_link(self, link_lower: str) -> bool:
+        if self._trap_ac is not None:
+            return next(self._trap_ac.iter(link_lower), None) is not None
+        return self._trap_re.search(link_lower) is not None
+
     def _is_valid_product_url(self, url: str) -> bool:
         site_patterns = self._detect_site_type(url)
-
-        # Check against site-specific patterns
-        for pattern in site_patterns['product_patterns']:
-            if re.search(pattern, url):
-                return True
-
-        return False
+        return site_patterns['product_re'].search(url) is not None
 
 
     async def _fetch_page(
@@ -217,93 +442,121 @@ class EnhancedEcommerceCrawler:
             url: str,
             domain: str
     ) -> str:
-        self.stats['requests'] += 1
+        self.requests += 1
 
         try:
             headers = self._get_headers(domain)
             async with session.get(
                     url,
                     headers=headers,
-                    timeout=10,
                     allow_redirects=True
             ) as response:
-                self.stats['successful_requests'] += 1
+                self.successful_requests += 1
+
+                # Only HTML bodies are worth reading and parsing
+                if response.content_type not in ('text/html', 'application/xhtml+xml'):
+                    return ""
+
                 return await response.text()
         except Exception as e:
-            self.stats['failed_requests'] += 1
-            self.logger.error(f"Error fetching {url}: {e}")
+            self.failed_requests += 1
+            self.logger.error("Error fetching %s: %s", url, e)
             return ""
 
-    async def _extract_links(self, base_url: str, html_content: str) -> Set[str]:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        links = set()
-
-        for a_tag in soup.find_all('a', href=True):
-            link = urljoin(base_url, a_tag['href'])
-            parsed_link = urlparse(link)
-
-            if parsed_link.netloc == urlparse(base_url).netloc:
-                links.add(link)
-
-        return links
+    async def _extract_valid_links(
+            self,
+            base_url: str,
+            html_content: str,
+            domain: str
+    ) -> Set[str]:
+        """Parse a page and classify its links in a single pass.
+
+        _parse_links already restricts hrefs to the page's host, so the
+        filter only has to run the trap/pagination/product checks once
+        per link instead of re-parsing every URL a second time.
+        """
+        if not html_content:
+            return set()
+
+        # Parsing is pure CPU; run it in the process pool so the event
+        # loop keeps serving network I/O while pages are parsed
+        loop = asyncio.get_running_loop()
+        links = await loop.run_in_executor(
+            self._parse_pool, _parse_links, base_url, html_content
+        )
+        return self._filter_valid_links(links, domain)
 
     def _get_headers(self, domain: str) -> Dict[str, str]:
-        headers = self.default_headers.copy()
-
-        if self.rotate_user_agents:
-            headers['User-Agent'] = self.ua.random
-
-        headers['Referer'] = f'https://{domain}'
+        # Defaults, Referer and custom headers never change for a domain;
+        # merge them once and only stamp UA and timestamp per request
+        template = self._header_templates.get(domain)
+        if template is None:
+            template = {
+                **_DEFAULT_HEADERS,
+                'Referer': f'https://{domain}',
+                **self.custom_headers
+            }
+            self._header_templates[domain] = template
 
-        headers.update(self.custom_headers)
+        headers = {**template, 'X-Request-Timestamp': format(time.time(), '.3f')}
 
-        headers['X-Request-Timestamp'] = str(datetime.now().timestamp())
+        if self.rotate_user_agents and 'User-Agent' not in self.custom_headers:
+            headers['User-Agent'] = random.choice(self._ua_pool)
 
         return headers
 
-    async def crawl_domain(self, domain: str) -> List[str]:
+    async def crawl_domain(self, domain: str, session: aiohttp.ClientSession) -> List[str]:
         base_url = f"https://{domain}"
         product_urls = set()
-        visited_urls = set()
+        visited_urls = _make_seen_set()
+        visited_urls.add(_canonicalize(base_url))
 
-        connector = aiohttp.TCPConnector(
-            limit_per_host=self.concurrent_requests,
-            force_close=True
-        )
+        # Bounded worker pool: live coroutines stay capped at
+        # concurrent_requests instead of growing with the link frontier
+        queue = asyncio.Queue()
+        queue.put_nowait((base_url, 0))
 
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async def crawl_page(url: str, depth: int):
-                if depth > self.max_depth or url in visited_urls:
-                    return
-
-                visited_urls.add(url)
+        async def worker():
+            while True:
+                url, depth = await queue.get()
 
                 # rate limiting
-                await asyncio.sleep(random.uniform(*self.delay_range))
+                await self._buckets[domain].acquire()
 
                 try:
-                    content = await self._fetch_with_fallback(url, session)
+                    content = await self._fetch_with_fallback(url, session, domain)
 
                     if self._is_valid_product_url(url):
                         product_urls.add(url)
-                        self.logger.info(f"Found product URL: {url}")
+                        self.logger.info("Found product URL: %s", url)
 
-                    # Extract and validate links
-                    links = await self._extract_links(url, content)
-                    valid_links = self._filter_valid_links(links, domain)
+                    # Extract and validate links in one pass
+                    valid_links = await self._extract_valid_links(url, content, domain)
 
-                    tasks = []
-                    for link in valid_links:
-                        if link not in visited_urls:
-                            tasks.append(crawl_page(link, depth + 1))
-
-                    if tasks:
-                        await asyncio.gather(*tasks)
+                    if depth < self.max_depth:
+                        for link in valid_links:
+                            if _SKIP_EXT_RE.search(link):
+                                continue
+                            key = _canonicalize(link)
+                            if key not in visited_urls:
+                                visited_urls.add(key)
+                                queue.put_nowait((link, depth + 1))
 
                 except Exception as e:
-                    self.logger.error(f"Error crawling {url}: {e}")
+                    self.logger.error("Error crawling %s: %s", url, e)
+                finally:
+                    queue.task_done()
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(self.concurrent_requests)
+        ]
 
-            await crawl_page(base_url, 0)
+        try:
+            await queue.join()
+        finally:
+            for w in workers:
+                w.cancel()
 
         return list(product_urls)
 
@@ -311,29 +564,79 @@ class EnhancedEcommerceCrawler:
         domain = domain.replace('https://', '').replace('http://', '')
         return domain.rstrip('/')
 
-    def _filter_valid_links(self, links: Set[str], domain: str) -> Set[str]:
+    def _get_hyperscan_db(self, site_patterns: Dict):
+        db = site_patterns.get('hs_db')
+        if db is None:
+            expressions, ids, flags = [], [], []
+
+            for keyword in TRAP_KEYWORDS:
+                expressions.append(keyword.encode())
+                ids.append(_HS_TRAP)
+                flags.append(hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_CASELESS)
+
+            for pattern in site_patterns['pagination_patterns']:
+                expressions.append(pattern.encode())
+                ids.append(_HS_PAGINATION)
+                flags.append(hyperscan.HS_FLAG_SINGLEMATCH)
+
+            for pattern in site_patterns['product_patterns']:
+                expressions.append(pattern.encode())
+                ids.append(_HS_PRODUCT)
+                flags.append(hyperscan.HS_FLAG_SINGLEMATCH)
+
+            db = hyperscan.Database()
+            try:
+                db.compile(
+                    expressions=expressions,
+                    ids=ids,
+                    elements=len(expressions),
+                    flags=flags
+                )
+            except hyperscan.error:
+                # Patterns with zero-width assertions only compile in
+                # prefilter mode; matches are then confirmed with the
+                # exact regex before a link is accepted
+                db.compile(
+                    expressions=expressions,
+                    ids=ids,
+                    elements=len(expressions),
+                    flags=[f | hyperscan.HS_FLAG_PREFILTER for f in flags]
+                )
+            site_patterns['hs_db'] = db
+
+        return db
+
+    def _filter_valid_links(self, links, domain: str) -> Set[str]:
         valid_links = set()
         site_patterns = self._detect_site_type(domain)
 
-        for link in links:
-            parsed_link = urlparse(link)
-
-            # Skip invalid or non-matching domains
-            if parsed_link.netloc != domain:
-                continue
+        # Callers only hand over same-host links, extracted against the
+        # page's own base URL, so no per-link netloc re-parse is needed
+        if hyperscan is not None:
+            # One DFA pass per link matches trap, pagination and product
+            # patterns together instead of separate regex probes
+            db = self._get_hyperscan_db(site_patterns)
+            for link in links:
+                found = set()
+                db.scan(
+                    link.encode(),
+                    match_event_handler=lambda i, s, e, f, c: found.add(i)
+                )
+                if _HS_TRAP in found:
+                    continue
+                if _HS_PAGINATION in found:
+                    valid_links.add(link)
+                elif _HS_PRODUCT in found and site_patterns['product_re'].search(link):
+                    valid_links.add(link)
+            return valid_links
 
+        for link in links:
             # Skip common trap patterns
-            if any(trap in link.lower() for trap in [
-                'login', 'signin', 'cart', 'checkout', 'account',
-                'wishlist', 'unsubscribe', 'email-preference'
-            ]):
+            if self._is_trap_link(link.lower()):
                 continue
 
             # Check for pagination patterns
-            is_pagination = any(
-                re.search(pattern, link)
-                for pattern in site_patterns['pagination_patterns']
-            )
+            is_pagination = site_patterns['pagination_re'].search(link) is not None
 
             if is_pagination or self._is_valid_product_url(link):
                 valid_links.add(link)
@@ -341,40 +644,66 @@ class EnhancedEcommerceCrawler:
         return valid_links
 
     async def discover_product_urls(self) -> Dict[str, List[str]]:
-        self.stats['start_time'] = datetime.now()
+        self.start_time = datetime.now()
         results = {}
 
-        async def crawl_with_timeout(domain):
-            try:
-                product_urls = await asyncio.wait_for(
-                    self.crawl_domain(domain),
-                    timeout=300  # 5-minute timeout per domain
-                )
-                results[domain] = product_urls
-            except asyncio.TimeoutError:
-                self.logger.warning(f"Crawling {domain} timed out")
-                results[domain] = []
+        # One shared session so TCP/TLS connections are kept alive and
+        # reused across the whole crawl instead of re-handshaking per URL
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrent_requests * len(self.domains),
+            limit_per_host=self.concurrent_requests,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            enable_cleanup_closed=True,
+            # c-ares resolves in the loop instead of a getaddrinfo thread
+            resolver=aiohttp.AsyncResolver() if aiodns is not None else None
+        )
 
-        await asyncio.gather(
-            *[crawl_with_timeout(domain) for domain in self.domains]
+        self._parse_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count()
         )
 
-        self.stats['end_time'] = datetime.now()
+        try:
+            async with aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=_CLIENT_TIMEOUT
+            ) as session:
+                async def crawl_with_timeout(domain):
+                    try:
+                        product_urls = await asyncio.wait_for(
+                            self.crawl_domain(domain, session),
+                            timeout=300  # 5-minute timeout per domain
+                        )
+                        results[domain] = product_urls
+                    except asyncio.TimeoutError:
+                        self.logger.warning("Crawling %s timed out", domain)
+                        results[domain] = []
+
+                await asyncio.gather(
+                    *[crawl_with_timeout(domain) for domain in self.domains]
+                )
+        finally:
+            self._parse_pool.shutdown(wait=False)
+            await self._close_browser()
+
+        self.end_time = datetime.now()
         return results
 
     def run(self) -> Dict[str, List[str]]:
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
         return asyncio.run(self.discover_product_urls())
 
     def print_stats(self):
-        if self.stats['start_time'] and self.stats['end_time']:
-            duration = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
-            success_rate = (self.stats['successful_requests'] / self.stats['requests'] * 100
-                            if self.stats['requests'] > 0 else 0)
+        if self.start_time and self.end_time:
+            duration = (self.end_time - self.start_time).total_seconds()
+            success_rate = (self.successful_requests / self.requests * 100
+                            if self.requests > 0 else 0)
 
             print("\nCrawling Statistics:")
-            print(f"Total Requests: {self.stats['requests']}")
-            print(f"Successful Requests: {self.stats['successful_requests']}")
-            print(f"Failed Requests: {self.stats['failed_requests']}")
+            print(f"Total Requests: {self.requests}")
+            print(f"Successful Requests: {self.successful_requests}")
+            print(f"Failed Requests: {self.failed_requests}")
             print(f"Success Rate: {success_rate:.2f}%")
             print(f"Total Duration: {duration:.2f} seconds")
 
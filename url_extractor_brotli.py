@@ -1,19 +1,94 @@
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from bs4 import BeautifulSoup, SoupStrainer
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+import concurrent.futures
+import itertools
+import os
 import re
+import sys
 from typing import List, Dict, Set
 import json
 import logging
 import random
 from fake_useragent import UserAgent
-from datetime import datetime
-import brotli  # Add brotli support
-import gzip
+import time
 from aiohttp import ClientTimeout
 from aiohttp_retry import RetryClient, ExponentialRetry
 
+try:
+    import uvloop  # optional: libuv event loop, ~2x async throughput
+except ImportError:
+    uvloop = None
+
+try:
+    import cchardet  # optional: C charset detector for the parser fallback
+except ImportError:
+    cchardet = None
+
+# Only anchor tags with an href matter; the strainer keeps the parser
+# from building soup objects for the rest of the document
+_A_STRAINER = SoupStrainer('a', href=True)
+
+# Discovery only needs href values, so a linear byte scan beats building
+# a DOM; fragments are cut at the '#' by the excluded character class
+_HREF_RE = re.compile(rb'<a\b[^>]*?\shref\s*=\s*["\']([^"\'#]+)', re.IGNORECASE)
+
+# Immutable per-request settings, built once instead of per fetch
+_REQUEST_TIMEOUT = ClientTimeout(total=30, connect=10, sock_connect=10, sock_read=10)
+
+
+def _decode_html(buf: bytes) -> str:
+    """Decode page bytes for the parser path.
+
+    The href-regex path never decodes; this only runs for the
+    BeautifulSoup fallback, where handing it a str skips UnicodeDammit's
+    slower pure-Python charset guessing.
+    """
+    encoding = None
+    if cchardet is not None:
+        encoding = cchardet.detect(buf)['encoding']
+    return buf.decode(encoding or 'utf-8', errors='replace')
+
+
+def _extract_hrefs(base_url: str, html_content: bytes, use_regex: bool) -> Set[str]:
+    links = set()
+    # The base netloc is the same for every link on the page; urlsplit
+    # skips the params parsing that urlparse pays for
+    base_netloc = urlsplit(base_url).netloc
+
+    if use_regex:
+        for match in _HREF_RE.finditer(html_content):
+            link = urljoin(base_url, match.group(1).decode('ascii', 'ignore'))
+
+            if urlsplit(link).netloc == base_netloc:
+                links.add(link)
+
+        return links
+
+    # lxml is a C parser; html.parser tokenizes in pure Python
+    soup = BeautifulSoup(_decode_html(html_content), 'lxml', parse_only=_A_STRAINER)
+
+    for a_tag in soup.find_all('a', href=True):
+        link = urljoin(base_url, a_tag['href'])
+
+        if urlsplit(link).netloc == base_netloc:
+            links.add(link)
+
+    return links
+
+
+def _canonicalize(url: str) -> str:
+    """Normalize a URL so fragment and query-order variants dedupe to one key.
+
+    Interning the result makes repeat set lookups pointer comparisons.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query)))
+    return sys.intern(urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, '')
+    ))
+
 
 class EcommerceCrawler:
     def __init__(
@@ -22,14 +97,31 @@ class EcommerceCrawler:
             max_depth: int = 3,
             concurrent_requests: int = 10,
             custom_headers: Dict[str, str] = None,
-            rotate_user_agents: bool = True
+            rotate_user_agents: bool = True,
+            regex_link_extraction: bool = True
     ):
         self.domains = [self._normalize_domain(domain) for domain in domains]
         self.max_depth = max_depth
         self.concurrent_requests = concurrent_requests
         self.custom_headers = custom_headers or {}
         self.rotate_user_agents = rotate_user_agents
+        # Fall back to a real HTML parse when the fast byte scan is not
+        # trustworthy enough (e.g. heavily malformed markup)
+        self.regex_link_extraction = regex_link_extraction
         self.ua = UserAgent()
+        # Sample fake_useragent once and cycle the ring; next() is a
+        # pointer bump vs a data-blob lookup plus RNG call per request
+        self._ua_pool = [self.ua.random for _ in range(128)]
+        self._ua_iter = itertools.cycle(self._ua_pool)
+        # Static headers ride on the session; only the per-domain Referer
+        # needs caching here
+        self._header_templates = {}
+
+        # Threads start lazily, so the pool costs nothing until the first
+        # page is parsed
+        self._parse_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=os.cpu_count()
+        )
 
         # Default headers with explicit compression support
         self.default_headers = {
@@ -54,6 +146,12 @@ class EcommerceCrawler:
             r'/shop/',
             r'\d{4,8}'
         ]
+        # One compiled alternation: the engine walks each URL once instead
+        # of restarting a scan per pattern
+        self._product_re = re.compile(
+            '|'.join(f'(?:{p})' for p in self.product_url_patterns),
+            re.IGNORECASE
+        )
 
         logging.basicConfig(
             level=logging.INFO,
@@ -61,143 +159,114 @@ class EcommerceCrawler:
         )
         self.logger = logging.getLogger(__name__)
 
-        self.stats = {
-            'requests': 0,
-            'successful_requests': 0,
-            'failed_requests': 0,
-            'start_time': None,
-            'end_time': None
-        }
+        # Plain attributes: single-threaded asyncio never preempts the
+        # += between tasks, and attribute access skips the dict hashing
+        self.requests = 0
+        self.successful_requests = 0
+        self.failed_requests = 0
+        self.start_time = None
+        self.end_time = None
 
     def _normalize_domain(self, domain: str) -> str:
         domain = domain.replace('https://', '').replace('http://', '')
         return domain.rstrip('/')
 
-    async def _decode_response(self, response: aiohttp.ClientResponse) -> str:
-        content = await response.read()
-
-        encoding = response.headers.get('Content-Encoding', '').lower()
-
-        try:
-            if encoding == 'br':
-                decoded_content = brotli.decompress(content)
-            elif encoding == 'gzip':
-                decoded_content = gzip.decompress(content)
-            elif encoding == 'deflate':
-                decoded_content = content  # aiohttp handles deflate automatically
-            else:
-                decoded_content = content
-
-            # Convert bytes to string using the response's charset or utf-8 as fallback
-            charset = response.charset or 'utf-8'
-            return decoded_content.decode(charset, errors='replace')
-
-        except Exception as e:
-            self.logger.error(f"Error decoding content with {encoding} encoding: {e}")
-            raise
-
     def _is_potential_product_url(self, url: str) -> bool:
-        url = url.lower()
-        return any(re.search(pattern, url) for pattern in self.product_url_patterns)
+        return self._product_re.search(url) is not None
 
     async def _fetch_page(
             self,
-            session: aiohttp.ClientSession,
+            client: RetryClient,
             url: str,
             domain: str
-    ) -> str:
-        self.stats['requests'] += 1
-
-        timeout = ClientTimeout(total=30, connect=10, sock_connect=10, sock_read=10)
+    ) -> bytes:
+        self.requests += 1
 
         try:
             headers = self._get_headers(domain)
 
-            retry_options = ExponentialRetry(
-                attempts=3,
-                start_timeout=1,
-                max_timeout=10,
-                factor=2,
-                statuses={500, 502, 503, 504}
-            )
-
-            async with RetryClient(
-                    client_session=session,
-                    retry_options=retry_options
-            ) as client:
-                async with client.get(
-                        url,
-                        headers=headers,
-                        timeout=timeout,
-                        allow_redirects=True
-                ) as response:
-                    if response.status == 200:
-                        content = await self._decode_response(response)
-                        self.stats['successful_requests'] += 1
-                        return content
-                    else:
-                        self.stats['failed_requests'] += 1
-                        self.logger.error(
-                            f"Failed to fetch {url}: Status {response.status}"
-                        )
-                        return ""
+            async with client.get(
+                    url,
+                    headers=headers,
+                    timeout=_REQUEST_TIMEOUT,
+                    allow_redirects=True
+            ) as response:
+                if response.status == 200:
+                    # aiohttp inflates gzip/deflate/br transparently while
+                    # streaming; draining 64 KiB chunks into a bytearray
+                    # keeps the transport buffer small instead of letting
+                    # read() queue the whole body before joining it
+                    content = bytearray()
+                    async for chunk in response.content.iter_chunked(65536):
+                        content += chunk
+                    self.successful_requests += 1
+                    return bytes(content)
+                else:
+                    self.failed_requests += 1
+                    self.logger.error(
+                        f"Failed to fetch {url}: Status {response.status}"
+                    )
+                    return b""
 
         except asyncio.TimeoutError:
-            self.stats['failed_requests'] += 1
+            self.failed_requests += 1
             self.logger.error(f"Timeout while fetching {url}")
-            return ""
+            return b""
 
         except Exception as e:
-            self.stats['failed_requests'] += 1
+            self.failed_requests += 1
             self.logger.error(f"Error fetching {url}: {str(e)}")
-            return ""
-
-    async def _extract_links(self, base_url: str, html_content: str) -> Set[str]:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        links = set()
-
-        for a_tag in soup.find_all('a', href=True):
-            link = urljoin(base_url, a_tag['href'])
-            parsed_link = urlparse(link)
-
-            if parsed_link.netloc == urlparse(base_url).netloc:
-                links.add(link)
-
-        return links
+            return b""
+
+    async def _extract_links(self, base_url: str, html_content: bytes) -> Set[str]:
+        # Scanning a large page blocks the event loop; in a worker thread
+        # the regex/lxml C code releases the GIL so network reads for the
+        # other coroutines keep flowing
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._parse_pool,
+            _extract_hrefs,
+            base_url,
+            html_content,
+            self.regex_link_extraction
+        )
 
 
     def _get_headers(self, domain: str) -> Dict[str, str]:
-        headers = self.default_headers.copy()
+        # Statics live on the session and are merged by aiohttp's C-backed
+        # CIMultiDict; only the volatile entries are built here
+        template = self._header_templates.get(domain)
+        if template is None:
+            template = self._header_templates[domain] = {
+                'Referer': f'https://{domain}'
+            }
 
-        if self.rotate_user_agents:
-            headers['User-Agent'] = self.ua.random
+        # time.time() skips the datetime object build and timezone math
+        headers = template | {'X-Request-Timestamp': str(time.time())}
 
-        headers['Referer'] = f'https://{domain}'
-        headers.update(self.custom_headers)
-        headers['X-Request-Timestamp'] = str(datetime.now().timestamp())
+        if self.rotate_user_agents and 'User-Agent' not in self.custom_headers:
+            headers['User-Agent'] = next(self._ua_iter)
 
         return headers
 
 
-    async def crawl_domain(self, domain: str) -> List[str]:
+    async def crawl_domain(self, domain: str, client: RetryClient) -> List[str]:
         base_url = f"https://{domain}"
         product_urls = set()
         visited_urls = set()
 
-        connector = aiohttp.TCPConnector(
-            limit_per_host=self.concurrent_requests,
-            force_close=True
-        )
-
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async def crawl_page(url: str, depth: int):
-                if depth > self.max_depth or url in visited_urls:
-                    return
-
-                visited_urls.add(url)
+        # Bounded worker pool: the recursive gather spawned one task
+        # per discovered link, so nothing actually enforced
+        # concurrent_requests and the task tree grew with the fan-out
+        queue = asyncio.Queue()
+        queue.put_nowait((base_url, 0))
+        visited_urls.add(_canonicalize(base_url))
 
+        async def worker():
+            while True:
+                url, depth = await queue.get()
                 try:
-                    html_content = await self._fetch_page(session, url, domain)
+                    html_content = await self._fetch_page(client, url, domain)
 
                     if self._is_potential_product_url(url):
                         product_urls.add(url)
@@ -205,61 +274,114 @@ class EcommerceCrawler:
 
                     links = await self._extract_links(url, html_content)
 
-                    tasks = []
-                    for link in links:
-                        if self._is_potential_product_url(link) and link not in visited_urls:
-                            tasks.append(crawl_page(link, depth + 1))
-
-                    if tasks:
-                        await asyncio.gather(*tasks)
+                    if depth < self.max_depth:
+                        # Canonical keys collapse fragment/query-order
+                        # variants that would refetch the same page; the
+                        # keys-minus-set difference drops already-seen
+                        # URLs in one C-level operation
+                        candidates = {
+                            _canonicalize(link): link
+                            for link in links
+                            if self._product_re.search(link)
+                        }
+                        new_keys = candidates.keys() - visited_urls
+                        visited_urls.update(new_keys)
+                        for key in new_keys:
+                            queue.put_nowait((candidates[key], depth + 1))
 
                 except Exception as e:
                     self.logger.error(f"Error crawling {url}: {e}")
+                finally:
+                    queue.task_done()
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(self.concurrent_requests)
+        ]
 
-            await crawl_page(base_url, 0)
+        try:
+            await queue.join()
+        finally:
+            for w in workers:
+                w.cancel()
 
         return list(product_urls)
 
 
     async def discover_product_urls(self) -> Dict[str, List[str]]:
-        self.stats['start_time'] = datetime.now()
+        # monotonic is immune to clock adjustments and cheaper to read
+        self.start_time = time.monotonic()
         results = {}
 
-        async def crawl_with_timeout(domain):
-            try:
-                product_urls = await asyncio.wait_for(
-                    self.crawl_domain(domain),
-                    timeout=300  # 5-minute timeout per domain
-                )
-                results[domain] = product_urls
-            except asyncio.TimeoutError:
-                self.logger.warning(f"Crawling {domain} timed out")
-                results[domain] = []
-
-        await asyncio.gather(
-            *[crawl_with_timeout(domain) for domain in self.domains]
+        # One session (connector, DNS cache, SSL context) and one
+        # RetryClient shared by every domain; per-domain sessions repeated
+        # that setup for each crawl
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrent_requests * max(len(self.domains), 1),
+            limit_per_host=self.concurrent_requests,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True
         )
 
-        self.stats['end_time'] = datetime.now()
+        retry_options = ExponentialRetry(
+            attempts=3,
+            start_timeout=1,
+            max_timeout=10,
+            factor=2,
+            statuses={500, 502, 503, 504}
+        )
+
+        async with aiohttp.ClientSession(
+                    connector=connector,
+                    headers=self.default_headers | self.custom_headers
+                ) as session, \
+                RetryClient(
+                    client_session=session,
+                    retry_options=retry_options
+                ) as client:
+            async def crawl_with_timeout(domain):
+                try:
+                    product_urls = await asyncio.wait_for(
+                        self.crawl_domain(domain, client),
+                        timeout=300  # 5-minute timeout per domain
+                    )
+                    results[domain] = product_urls
+                except asyncio.TimeoutError:
+                    self.logger.warning(f"Crawling {domain} timed out")
+                    results[domain] = []
+
+            await asyncio.gather(
+                *[crawl_with_timeout(domain) for domain in self.domains]
+            )
+
+        self.end_time = time.monotonic()
         return results
 
 
-    def run(self) -> Dict[str, List[str]]:
-        """Execute crawler and return results."""
-        return asyncio.run(self.discover_product_urls())
+    def run(self, loop_factory=None) -> Dict[str, List[str]]:
+        """Execute crawler and return results.
+
+        loop_factory lets callers plug in an alternative event loop
+        implementation (e.g. an io_uring-backed loop on recent Linux
+        kernels); defaults to uvloop when installed.
+        """
+        if loop_factory is None and uvloop is not None:
+            loop_factory = uvloop.new_event_loop
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            return runner.run(self.discover_product_urls())
 
 
     def print_stats(self):
         """Print crawling statistics."""
-        if self.stats['start_time'] and self.stats['end_time']:
-            duration = (self.stats['end_time'] - self.stats['start_time']).total_seconds()
-            success_rate = (self.stats['successful_requests'] / self.stats['requests'] * 100
-                            if self.stats['requests'] > 0 else 0)
+        if self.start_time is not None and self.end_time is not None:
+            duration = self.end_time - self.start_time
+            success_rate = (self.successful_requests / self.requests * 100
+                            if self.requests > 0 else 0)
 
             print("\nCrawling Statistics:")
-            print(f"Total Requests: {self.stats['requests']}")
-            print(f"Successful Requests: {self.stats['successful_requests']}")
-            print(f"Failed Requests: {self.stats['failed_requests']}")
+            print(f"Total Requests: {self.requests}")
+            print(f"Successful Requests: {self.successful_requests}")
+            print(f"Failed Requests: {self.failed_requests}")
             print(f"Success Rate: {success_rate:.2f}%")
             print(f"Total Duration: {duration:.2f} seconds")
 